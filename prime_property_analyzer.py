@@ -14,22 +14,26 @@ theorems presented in the paper.
     breaking down results by mod-6 residue and last-digit patterns.
 
 The script is optimized using Numba for high-performance computation.
+Compiled kernels are cached in __pycache__, so only the first run pays the
+JIT compilation cost.
 
 Usage:
     python prime_property_analyzer.py --max-prime 1000000 --run-all
 
 Requirements:
-    - Python 3.7+
+    - Python 3.8+
     - numpy
     - numba
 """
 
 import argparse
+import sys
 import time
-from typing import Dict, List, Tuple
+from math import isqrt
+from typing import List, Tuple
 
 import numpy as np
-from numba import jit
+from numba import cuda, get_num_threads, jit, prange, types
 
 # --- Constants ---
 GAPS_TO_ANALYZE = [2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 24, 30]
@@ -39,106 +43,341 @@ GAP_NAMES = {
     20: "Gap-20", 24: "Gap-24", 30: "Gap-30"
 }
 MOD6_GAPS = [6, 12, 18, 24, 30]
+# Most gaps a single scan can cover; sizes the CUDA shared-memory tables.
+N_GAPS = len(GAPS_TO_ANALYZE)
+# Residues mod 30 not divisible by 2, 3 or 5, i.e. the spokes of the sieve wheel.
+WHEEL_RESIDUES = np.array([1, 7, 11, 13, 17, 19, 23, 29], dtype=np.int64)
+# WHEEL_COLUMNS[n % 30] is the bit index of n within its block (-1 off the wheel).
+WHEEL_COLUMNS = np.full(30, -1, dtype=np.int64)
+WHEEL_COLUMNS[WHEEL_RESIDUES] = np.arange(len(WHEEL_RESIDUES))
+# Bytes of wheel sieve crossed off at a time; sized to fit in a 32 KiB L1 cache.
+SIEVE_SEGMENT_BYTES = 32 * 1024
+# DELTA_MOD3_LUT[X mod 3, Y] = Δ(10X + Y) mod 3, since 10X ≡ 10 * (X mod 3) (mod 3).
+DELTA_MOD3_LUT = np.fromfunction(
+    lambda xm, y: (xm * xm + y * y - (10 * xm + y)) % 3, (3, 10), dtype=np.int64
+).astype(np.uint8)
+# The gap scan moves to the GPU from this limit on, if one is available.
+CUDA_MIN_PRIME = 10**8
+CUDA_THREADS_PER_BLOCK = 256
 
 # --- Core Numba-Optimized Functions ---
 
-@jit(nopython=True)
-def is_prime(n: int) -> bool:
-    """Fast primality test for integers."""
-    if n < 2:
-        return False
-    if n == 2:
-        return True
-    if n % 2 == 0:
-        return False
-    i = 3
-    while i * i <= n:
-        if n % i == 0:
-            return False
-        i += 2
-    return True
-
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
+def _sieve_wheel_segments(
+    sieve: np.ndarray, sieving_primes: np.ndarray, segment_size: int
+) -> None:
+    """Numba-optimized crossing-off for the wheel sieve, one segment at a time.
+
+    For every sieving prime p and wheel residue, the next block to clear is
+    remembered between segments, so each segment is finished while it is
+    still resident in L1 before moving on to the next one.
+    """
+    n = len(sieving_primes)
+    next_block = np.empty((n, 8), dtype=np.int64)
+    bit_masks = np.empty((n, 8), dtype=np.uint8)
+    for i in range(n):
+        p = sieving_primes[i]
+        for k in range(8):
+            # Smallest multiple p * m with m >= p and m ≡ WHEEL_RESIDUES[k] (mod 30).
+            start = p * (p + (WHEEL_RESIDUES[k] - p) % 30)
+            next_block[i, k] = start // 30
+            bit_masks[i, k] = 0xFF ^ (1 << WHEEL_COLUMNS[start % 30])
+
+    for low in range(0, len(sieve), segment_size):
+        high = min(low + segment_size, len(sieve))
+        for i in range(n):
+            p = sieving_primes[i]
+            for k in range(8):
+                block = next_block[i, k]
+                mask = bit_masks[i, k]
+                while block < high:
+                    sieve[block] &= mask
+                    block += p
+                next_block[i, k] = block
+
 def generate_primes_array(max_n: int) -> np.ndarray:
-    """Generates a numpy array of all prime numbers up to max_n."""
-    primes = []
-    for n in range(2, max_n + 1):
-        if is_prime(n):
-            primes.append(n)
-    return np.array(primes, dtype=np.int64)
-
-@jit(nopython=True)
-def compute_delta(n: int) -> int:
-    """Computes the Δ(n) = X² + Y² - n property for a number n in base 10."""
-    if n < 10:
-        return -1
-    x = n // 10
-    y = n % 10
-    return x * x + y * y - n
-
-@jit(nopython=True)
-def _collect_base10_data(
-    primes: np.ndarray, gap: int, modulus: int
-) -> Tuple[int, int, List[Tuple[int, int]]]:
-    """Numba-optimized core logic to collect data for base-10 analysis for p >= 11."""
-    total_pairs = 0
-    successful_pairs = 0
-    counterexamples = []
-    prime_set = set(primes)
-
-    for p1 in primes:
-        # **MODIFICATION**: Strictly enforce p >= 11 as per the paper's theorems.
+    """Generates a numpy array of all prime numbers up to max_n.
+
+    Uses a segmented {2, 3, 5} wheel Sieve of Eratosthenes: each byte of the
+    sieve covers a block of 30 integers, one bit per residue coprime to 30,
+    and the sieve is crossed off in SIEVE_SEGMENT_BYTES chunks. The sieving
+    primes up to sqrt(max_n) come from a recursive call.
+    """
+    if max_n < 2:
+        return np.empty(0, dtype=np.int64)
+
+    sieving_primes = generate_primes_array(isqrt(max_n))
+    sieving_primes = sieving_primes[sieving_primes >= 7]
+
+    sieve = np.full(max_n // 30 + 1, 0xFF, dtype=np.uint8)
+    sieve[0] &= 0xFE  # 1 is not prime.
+    _sieve_wheel_segments(sieve, sieving_primes, SIEVE_SEGMENT_BYTES)
+
+    blocks, columns = np.nonzero(
+        np.unpackbits(sieve[:, None], axis=1, bitorder='little')
+    )
+    primes = 30 * blocks.astype(np.int64) + WHEEL_RESIDUES[columns]
+    small = np.array([2, 3, 5], dtype=np.int64)
+    return np.concatenate((small[small <= max_n], primes[primes <= max_n]))
+
+def build_prime_mask(primes: np.ndarray, max_n: int) -> np.ndarray:
+    """Returns a boolean array where mask[n] is True iff n is a prime <= max_n."""
+    is_prime_mask = np.zeros(max(max_n, 1) + 1, dtype=np.bool_)
+    is_prime_mask[primes] = True
+    return is_prime_mask
+
+def precompute_prime_features(
+    primes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns uint8 arrays of X mod 3, Y and Δ(p) mod 3 (via DELTA_MOD3_LUT), aligned with primes."""
+    x, y = np.divmod(primes, 10)
+    x_mod3 = (x % 3).astype(np.uint8)
+    y = y.astype(np.uint8)
+    return x_mod3, y, DELTA_MOD3_LUT[x_mod3, y]
+
+@jit(nopython=True, parallel=True, cache=True)
+def _scan_pairs_fused(
+    primes: np.ndarray, is_prime_mask: np.ndarray, y: np.ndarray,
+    delta_mod3: np.ndarray, gaps: np.ndarray, n_chunks: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Numba-optimized single pass over `primes` collecting every gap's data for p >= 11.
+
+    Each prime p1 is visited once and checked against all gaps while its
+    features are hot in cache. `primes` is split into `n_chunks` ranges
+    scanned in parallel; every output has a leading chunk axis and pairs
+    are stored as (index of p1, index of p2) in `primes`.
+    Pattern codes are 10 * Y₁ + Y₂; the last axis of the counts is
+    [total, success].
+    """
+    n = len(primes)
+    n_gaps = len(gaps)
+    residue_counts = np.zeros((n_chunks, n_gaps, 6, 2), dtype=np.int64)
+    pattern_counts = np.zeros((n_chunks, n_gaps, 100, 2), dtype=np.int64)
+    first_failure = np.full((n_chunks, n_gaps, 100, 2), -1, dtype=np.int64)
+    counterexamples = np.full((n_chunks, n_gaps, 10, 2), -1, dtype=np.int64)
+    n_counterexamples = np.zeros((n_chunks, n_gaps), dtype=np.int64)
+
+    for c in prange(n_chunks):
+        low = c * n // n_chunks
+        high = (c + 1) * n // n_chunks
+        # Index of p2 in `primes` for each gap; only ever moves forward.
+        cursor = np.full(n_gaps, low, dtype=np.int64)
+
+        for i in range(low, high):
+            p1 = primes[i]
+            if p1 < 11:
+                continue
+
+            for g in range(n_gaps):
+                p2 = p1 + gaps[g]
+                if p2 >= len(is_prime_mask) or not is_prime_mask[p2]:
+                    continue
+
+                j = cursor[g]
+                while primes[j] < p2:
+                    j += 1
+                cursor[g] = j
+
+                success = 1 if delta_mod3[i] == 0 or delta_mod3[j] == 0 else 0
+                code = 10 * y[i] + y[j]
+                residue_counts[c, g, p1 % 6, 0] += 1
+                residue_counts[c, g, p1 % 6, 1] += success
+                pattern_counts[c, g, code, 0] += 1
+                pattern_counts[c, g, code, 1] += success
+
+                if success == 0:
+                    if first_failure[c, g, code, 0] < 0:
+                        first_failure[c, g, code, 0] = i
+                        first_failure[c, g, code, 1] = j
+                    k = n_counterexamples[c, g]
+                    if k < 10:
+                        counterexamples[c, g, k, 0] = i
+                        counterexamples[c, g, k, 1] = j
+                        n_counterexamples[c, g] = k + 1
+
+    return (
+        residue_counts, pattern_counts, first_failure,
+        counterexamples, n_counterexamples,
+    )
+
+@cuda.jit(cache=True)
+def _scan_pairs_cuda(
+    primes, is_prime_mask, delta_mod3, gaps,
+    residue_counts, pattern_counts, first_failure
+):
+    """CUDA kernel for the fused scan: one thread per prime p1 >= 11.
+
+    Counts are accumulated in per-block shared-memory tables and flushed to
+    the flat global tables with one atomic add per non-zero entry. The
+    partner's features are recomputed from p2 rather than looked up, which
+    avoids a search for its index. first_failure keeps the smallest index
+    of p1 per (gap, pattern) via atomic min.
+    """
+    block_residues = cuda.shared.array(N_GAPS * 6 * 2, types.int64)
+    block_patterns = cuda.shared.array(N_GAPS * 100 * 2, types.int64)
+    tid = cuda.threadIdx.x
+    for k in range(tid, N_GAPS * 6 * 2, cuda.blockDim.x):
+        block_residues[k] = 0
+    for k in range(tid, N_GAPS * 100 * 2, cuda.blockDim.x):
+        block_patterns[k] = 0
+    cuda.syncthreads()
+
+    i = cuda.grid(1)
+    if i < primes.size and primes[i] >= 11:
+        p1 = primes[i]
+        residue = p1 % 6
+        y1 = p1 % 10
+        for g in range(gaps.size):
+            p2 = p1 + gaps[g]
+            if p2 < is_prime_mask.size and is_prime_mask[p2]:
+                x2, y2 = p2 // 10, p2 % 10
+                success = 1 if (
+                    delta_mod3[i] == 0 or DELTA_MOD3_LUT[x2 % 3, y2] == 0
+                ) else 0
+                code = 10 * y1 + y2
+                cuda.atomic.add(block_residues, (g * 6 + residue) * 2, 1)
+                cuda.atomic.add(block_residues, (g * 6 + residue) * 2 + 1, success)
+                cuda.atomic.add(block_patterns, (g * 100 + code) * 2, 1)
+                cuda.atomic.add(block_patterns, (g * 100 + code) * 2 + 1, success)
+                if success == 0:
+                    cuda.atomic.min(first_failure, g * 100 + code, i)
+    cuda.syncthreads()
+
+    for k in range(tid, residue_counts.size, cuda.blockDim.x):
+        if block_residues[k] != 0:
+            cuda.atomic.add(residue_counts, k, block_residues[k])
+    for k in range(tid, pattern_counts.size, cuda.blockDim.x):
+        if block_patterns[k] != 0:
+            cuda.atomic.add(pattern_counts, k, block_patterns[k])
+
+@jit(nopython=True, cache=True)
+def _first_counterexamples(
+    primes: np.ndarray, is_prime_mask: np.ndarray, delta_mod3: np.ndarray,
+    gaps: np.ndarray, needed: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Numba-optimized scan for the first `needed[g]` failing pairs of each gap.
+
+    Stops as soon as every gap has its quota, so with the failure counts
+    already known it only touches a short prefix of `primes`.
+    """
+    n_gaps = len(gaps)
+    counterexamples = np.full((n_gaps, 10, 2), -1, dtype=np.int64)
+    found = np.zeros(n_gaps, dtype=np.int64)
+    cursor = np.zeros(n_gaps, dtype=np.int64)
+    remaining = needed.sum()
+    limit = len(is_prime_mask)
+
+    for i in range(len(primes)):
+        if remaining == 0:
+            break
+        p1 = primes[i]
         if p1 < 11:
             continue
 
-        p2 = p1 + gap
-        if p2 > primes[-1]:
-            break
-        
-        if p2 in prime_set:
-            total_pairs += 1
-            delta1 = compute_delta(p1)
-            delta2 = compute_delta(p2)
-            mod1 = delta1 % modulus
-            mod2 = delta2 % modulus
-            
-            if mod1 == 0 or mod2 == 0:
-                successful_pairs += 1
-            else:
-                if len(counterexamples) < 10:
-                    counterexamples.append((p1, p2))
-    
-    return total_pairs, successful_pairs, counterexamples
-
-@jit(nopython=True)
-def _collect_mod6_data(
-    max_prime: int, gap: int
-) -> Tuple[List[Tuple], List[Tuple]]:
-    """Numba-optimized core logic for mod-6 structural analysis for p >= 11."""
-    mod6_results = []
-    digit_pattern_results = []
-
-    # Loop starts at 11, so p1 is always >= 11.
-    for p1 in range(11, max_prime - gap + 1):
-        if is_prime(p1):
-            p2 = p1 + gap
-            if is_prime(p2):
-                x1, y1 = p1 // 10, p1 % 10
-                x2, y2 = p2 // 10, p2 % 10
-                delta1 = x1 * x1 + y1 * y1 - p1
-                delta2 = x2 * x2 + y2 * y2 - p2
-                has_property = (delta1 % 3 == 0) or (delta2 % 3 == 0)
-                
-                mod6_results.append((p1 % 6, has_property))
-                digit_pattern_results.append((
-                    y1, y2, has_property, p1, p2, x1 % 3, x2 % 3
-                ))
-    
-    return mod6_results, digit_pattern_results
+        for g in range(n_gaps):
+            if found[g] >= needed[g]:
+                continue
+            p2 = p1 + gaps[g]
+            if p2 >= limit or not is_prime_mask[p2]:
+                continue
+
+            j = cursor[g]
+            while primes[j] < p2:
+                j += 1
+            cursor[g] = j
+
+            if delta_mod3[i] != 0 and delta_mod3[j] != 0:
+                counterexamples[g, found[g], 0] = i
+                counterexamples[g, found[g], 1] = j
+                found[g] += 1
+                remaining -= 1
+
+    return counterexamples, found
+
+def _collect_gap_statistics_cuda(
+    primes: np.ndarray, is_prime_mask: np.ndarray, delta_mod3: np.ndarray,
+    gaps: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]:
+    """GPU variant of collect_gap_statistics, with the same return values."""
+    n = len(primes)
+    n_gaps = len(gaps)
+    residue_counts = cuda.to_device(np.zeros(n_gaps * 6 * 2, dtype=np.int64))
+    pattern_counts = cuda.to_device(np.zeros(n_gaps * 100 * 2, dtype=np.int64))
+    first_failure = cuda.to_device(np.full(n_gaps * 100, n, dtype=np.int64))
+
+    blocks = (n + CUDA_THREADS_PER_BLOCK - 1) // CUDA_THREADS_PER_BLOCK
+    _scan_pairs_cuda[blocks, CUDA_THREADS_PER_BLOCK](
+        cuda.to_device(primes), cuda.to_device(is_prime_mask),
+        cuda.to_device(delta_mod3), cuda.to_device(gaps),
+        residue_counts, pattern_counts, first_failure
+    )
+    residue_counts = residue_counts.copy_to_host().reshape(n_gaps, 6, 2)
+    pattern_counts = pattern_counts.copy_to_host().reshape(n_gaps, 100, 2)
+    first_index = first_failure.copy_to_host().reshape(n_gaps, 100)
+
+    # Recover the partner's index for the first failing pair of each pattern.
+    merged_failure = np.full((n_gaps, 100, 2), -1, dtype=np.int64)
+    found = first_index < n
+    gap_of = np.broadcast_to(gaps[:, None], first_index.shape)
+    merged_failure[found, 0] = first_index[found]
+    merged_failure[found, 1] = np.searchsorted(
+        primes, primes[first_index[found]] + gap_of[found]
+    )
+
+    # Only as many counterexamples as each gap actually has are searched for.
+    failures = pattern_counts[..., 0].sum(axis=1) - pattern_counts[..., 1].sum(axis=1)
+    counterexamples, n_counterexamples = _first_counterexamples(
+        primes, is_prime_mask, delta_mod3, gaps, np.minimum(failures, 10)
+    )
+    examples = [counterexamples[g, :n_counterexamples[g]] for g in range(n_gaps)]
+
+    return residue_counts, pattern_counts, merged_failure, examples
+
+def collect_gap_statistics(
+    primes: np.ndarray, is_prime_mask: np.ndarray, y: np.ndarray,
+    delta_mod3: np.ndarray, scan_gaps: List[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]:
+    """Runs the fused scan for `scan_gaps` and merges the per-chunk results.
+
+    Returns, indexed by position in `scan_gaps`: residue counts (6, 2),
+    pattern counts (100, 2), the first failing pair per pattern (100, 2;
+    -1 if none) and up to 10 counterexample pairs, all as indices into
+    `primes`. Large runs are offloaded to the GPU when CUDA is available.
+    """
+    gaps = np.array(scan_gaps, dtype=np.int64)
+    if len(is_prime_mask) > CUDA_MIN_PRIME and cuda.is_available():
+        return _collect_gap_statistics_cuda(primes, is_prime_mask, delta_mod3, gaps)
+
+    (residue_counts, pattern_counts, first_failure,
+     counterexamples, n_counterexamples) = _scan_pairs_fused(
+        primes, is_prime_mask, y, delta_mod3, gaps, get_num_threads()
+    )
+
+    # Chunks are in prime order, so the earliest chunk with a hit wins.
+    merged_failure = first_failure[-1].copy()
+    for chunk in first_failure[-2::-1]:
+        found = chunk[..., 0] >= 0
+        merged_failure[found] = chunk[found]
+
+    merged_examples = [
+        np.concatenate([
+            counterexamples[c, g, :n_counterexamples[c, g]]
+            for c in range(len(counterexamples))
+        ])[:10]
+        for g in range(len(gaps))
+    ]
+
+    return (
+        residue_counts.sum(axis=0), pattern_counts.sum(axis=0),
+        merged_failure, merged_examples,
+    )
 
 # --- Analysis and Presentation Functions ---
 
-def run_base10_analysis(primes: np.ndarray):
+def run_base10_analysis(
+    primes: np.ndarray, scan_gaps: List[int], pattern_counts: np.ndarray,
+    counterexamples: List[np.ndarray]
+):
     """Runs and prints the analysis for various prime gaps in base 10, mod 3."""
     print("=" * 70)
     print("ANALYSIS 1: PROPERTY SUCCESS RATE FOR VARIOUS PRIME GAPS (p >= 11)")
@@ -149,7 +388,9 @@ def run_base10_analysis(primes: np.ndarray):
     print("-" * 70)
     
     for gap in GAPS_TO_ANALYZE:
-        total, success, counterex = _collect_base10_data(primes, gap, 3)
+        g = scan_gaps.index(gap)
+        total, success = pattern_counts[g].sum(axis=0)
+        counterex = primes[counterexamples[g]]
         
         if total > 0:
             rate = (success / total) * 100
@@ -164,12 +405,16 @@ def run_base10_analysis(primes: np.ndarray):
             
             print(f"{gap:<8} | {name:<9} | {total:>12,d} | {success:>10,d} | {rate:>8.2f}% | {status}")
             
-            if counterex:
+            if len(counterex) > 0:
                 ex_str = ", ".join([f"({p1},{p2})" for p1, p2 in counterex[:3]])
                 print(f"{'':11}└─ Counterexamples: {ex_str}, ...")
     print("\n")
 
-def run_mod6_analysis(max_prime: int):
+def run_mod6_analysis(
+    primes: np.ndarray, x_mod3: np.ndarray, scan_gaps: List[int],
+    residue_counts: np.ndarray, pattern_counts: np.ndarray,
+    first_failure: np.ndarray
+):
     """Runs and prints the detailed mod-6 structural analysis for p >= 11."""
     print("=" * 70)
     print("ANALYSIS 2: STRUCTURAL ANALYSIS OF GAPS DIVISIBLE BY 6 (p >= 11)")
@@ -177,54 +422,39 @@ def run_mod6_analysis(max_prime: int):
     print("\nInvestigating failure rates for gaps k ≡ 0 (mod 6).\n")
 
     for gap in MOD6_GAPS:
-        mod6_data, digit_data = _collect_mod6_data(max_prime, gap)
-
-        print("-" * 70)
-        print(f"Analysis for Gap {gap}")
-        print("-" * 70)
-
-        # ... (The rest of the printing logic remains the same)
-        print("\n(A) Breakdown by p (mod 6) residue class:")
-        stats_mod6 = {1: [0, 0], 5: [0, 0]}
-        for p_mod6, has_property in mod6_data:
-            stats_mod6[p_mod6][0] += 1
-            if has_property:
-                stats_mod6[p_mod6][1] += 1
-        
-        for res in sorted(stats_mod6.keys()):
-            total, success = stats_mod6[res]
+        g = scan_gaps.index(gap)
+        # Each gap's section is formatted into `lines` and written in one call.
+        lines = [
+            "-" * 70,
+            f"Analysis for Gap {gap}",
+            "-" * 70,
+        ]
+
+        lines.append("\n(A) Breakdown by p (mod 6) residue class:")
+        for res in (1, 5):
+            total, success = residue_counts[g, res]
             if total > 0:
                 rate = (success / total) * 100
-                print(f"  p ≡ {res} (mod 6): {success:,d}/{total:,d} pairs = {rate:.2f}% success")
+                lines.append(f"  p ≡ {res} (mod 6): {success:,d}/{total:,d} pairs = {rate:.2f}% success")
 
-        print("\n(B) Breakdown by last digit pattern (Y₁ → Y₂):")
-        stats_digit: Dict[str, List[int]] = {}
-        failing_examples: Dict[str, Tuple] = {}
-
-        for y1, y2, has_property, p1, p2, x1_mod3, x2_mod3 in digit_data:
-            pattern = f"{y1}→{y2}"
-            if pattern not in stats_digit:
-                stats_digit[pattern] = [0, 0]
-            
-            stats_digit[pattern][0] += 1
-            if has_property:
-                stats_digit[pattern][1] += 1
-            elif pattern not in failing_examples:
-                failing_examples[pattern] = (p1, p2, x1_mod3, x2_mod3)
-
-        for pattern in sorted(stats_digit.keys()):
-            total, success = stats_digit[pattern]
+        lines.append("\n(B) Breakdown by last digit pattern (Y₁ → Y₂):")
+        for code in np.flatnonzero(pattern_counts[g, :, 0]):
+            total, success = pattern_counts[g, code]
+            pattern = f"{code // 10}→{code % 10}"
             rate = (success / total) * 100
             status = "✓" if abs(rate - 100.0) < 1e-9 else "✗"
-            print(f"  {pattern:^5s}: {success:5,d}/{total:5,d} pairs = {rate:6.2f}% {status}")
-
-        if failing_examples:
-            print("\n(C) Details on first counterexample for failing patterns:")
-            for pattern, (p1, p2, x1, x2) in sorted(failing_examples.items()):
-                 print(f"  - Pattern {pattern}: e.g., ({p1},{p2}).")
-                 print(f"    (X₁≡{x1}, X₂≡{x2} mod 3 cause failure)")
+            lines.append(f"  {pattern:^5s}: {success:5,d}/{total:5,d} pairs = {rate:6.2f}% {status}")
+
+        failing_codes = np.flatnonzero(first_failure[g, :, 0] >= 0)
+        if len(failing_codes) > 0:
+            lines.append("\n(C) Details on first counterexample for failing patterns:")
+            for code in failing_codes:
+                 i, j = first_failure[g, code]
+                 lines.append(f"  - Pattern {code // 10}→{code % 10}: e.g., ({primes[i]},{primes[j]}).")
+                 lines.append(f"    (X₁≡{x_mod3[i]}, X₂≡{x_mod3[j]} mod 3 cause failure)")
         
-        print("\n")
+        lines.append("\n")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -242,12 +472,14 @@ def main():
     parser.add_argument(
         '-b', '--run-base10',
         action='store_true',
-        help='Run Analysis 1: General success rates for various gaps.'
+        help='Run Analysis 1: General success rates for various gaps.\n'
+             'Scans all 12 gaps, so it costs about as much as --run-all.'
     )
     parser.add_argument(
         '-m', '--run-mod6',
         action='store_true',
-        help='Run Analysis 2: Detailed mod-6 structural breakdown.'
+        help='Run Analysis 2: Detailed mod-6 structural breakdown.\n'
+             'Alone, only the 5 gaps divisible by 6 are scanned.'
     )
     parser.add_argument(
         '--run-all',
@@ -264,16 +496,31 @@ def main():
     print("=" * 70)
     print(f"\nSettings: Maximum prime = {args.max_prime:,d}\n")
     
-    if run_all or args.run_base10:
-        print("Generating primes for Analysis 1...")
-        start_time = time.time()
-        primes = generate_primes_array(args.max_prime)
-        end_time = time.time()
-        print(f"Found {len(primes):,d} primes in {end_time - start_time:.3f} seconds.\n")
-        run_base10_analysis(primes)
+    # Both analyses share a single sieve.
+    print("Generating primes...")
+    start_time = time.time()
+    primes = generate_primes_array(args.max_prime)
+    is_prime_mask = build_prime_mask(primes, args.max_prime)
+    x_mod3, y, delta_mod3 = precompute_prime_features(primes)
+    end_time = time.time()
+    print(f"Found {len(primes):,d} primes in {end_time - start_time:.3f} seconds.\n")
+
+    # One fused scan over the primes serves both analyses. MOD6_GAPS is a
+    # subset of GAPS_TO_ANALYZE, so Analysis 2 alone only scans those gaps.
+    run_base10 = run_all or args.run_base10
+    scan_gaps = GAPS_TO_ANALYZE if run_base10 else MOD6_GAPS
+    residue_counts, pattern_counts, first_failure, counterexamples = (
+        collect_gap_statistics(primes, is_prime_mask, y, delta_mod3, scan_gaps)
+    )
+
+    if run_base10:
+        run_base10_analysis(primes, scan_gaps, pattern_counts, counterexamples)
         
     if run_all or args.run_mod6:
-        run_mod6_analysis(args.max_prime)
+        run_mod6_analysis(
+            primes, x_mod3, scan_gaps, residue_counts, pattern_counts,
+            first_failure
+        )
 
     print("=" * 70)
     print("Analysis Complete.")